@@ -28,7 +28,12 @@ root_agent = Agent(
     instruction=f"""Use the tools to fetch customer data. Customer IDs are integers like 1, 2, 3.
 
 When user says "customer 1" or "customer ID 1", extract the number and call:
-get_customer_info(customer_id=1, api_key="{MCP_API_KEY}")
+get_customer_overview(customer_id=1, api_key="{MCP_API_KEY}")
+
+get_customer_overview returns profile, balance, recent transactions, loans and
+cards in one call. Use its "sections" argument to ask only for what the question
+needs, e.g. sections=["balance", "transactions"]. Do not chain get_customer_info,
+get_account_balance and get_last_transactions when one overview call answers it.
 
 Always use the tools. Never guess.""",
     tools=[mcp_toolset],
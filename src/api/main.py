@@ -1,12 +1,17 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 import sys
 import os
+import time
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from api.models import *
-from api.auth import create_access_token, verify_token, authenticate_user
+from api.auth import create_access_token, authenticate_user
+from api.ratelimit import admit_request
+from api.semantic_cache import SEMANTIC_CACHE_ENABLED, CACHE_LOOKUPS, semantic_cache
+from observability.metrics import REGISTRY, SIZE_BUCKETS
 
 app = FastAPI(title="Banking AI Agent API", version="1.0.0")
 
@@ -18,6 +23,49 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request metrics
+REQUEST_LATENCY = REGISTRY.histogram(
+    "api_request_latency_seconds", "HTTP request latency by route"
+)
+RESPONSE_BYTES = REGISTRY.histogram(
+    "api_response_bytes", "HTTP response size by route", buckets=SIZE_BUCKETS
+)
+REQUEST_ERRORS = REGISTRY.counter(
+    "api_request_errors_total", "HTTP requests answered with a 4xx/5xx status"
+)
+
+
+def _route_path(request: Request) -> str:
+    # Label by route template, not raw path, to keep cardinality bounded
+    route = request.scope.get("route")
+    return route.path if route is not None else "unmatched"
+
+
+@app.middleware("http")
+async def record_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    except Exception:
+        # Unhandled errors never produce a response here; count them as 500s
+        path = _route_path(request)
+        REQUEST_LATENCY.observe(
+            time.perf_counter() - start, method=request.method, path=path
+        )
+        REQUEST_ERRORS.inc(method=request.method, path=path, status=500)
+        raise
+
+    path = _route_path(request)
+    REQUEST_LATENCY.observe(
+        time.perf_counter() - start, method=request.method, path=path
+    )
+    size = response.headers.get("content-length")
+    if size is not None:
+        RESPONSE_BYTES.observe(int(size), method=request.method, path=path)
+    if response.status_code >= 400:
+        REQUEST_ERRORS.inc(method=request.method, path=path, status=response.status_code)
+    return response
+
 
 @app.post("/auth/login", response_model=TokenResponse)
 async def login(auth: AuthRequest):
@@ -29,25 +77,55 @@ async def login(auth: AuthRequest):
 
 
 @app.post("/agent/query", response_model=AgentResponse)
-async def query_agent(request: QueryRequest, username: str = Depends(verify_token)):
+async def query_agent(request: QueryRequest, username: str = Depends(admit_request)):
     """
-    Query the banking agent with authentication
+    Query the banking agent with authentication.
+    Rate limited per user and globally (429), and shed with 503 when the
+    in-flight queue is full.
     """
+    # Generic (non customer-specific) questions may be answered from the
+    # semantic cache instead of paying for a full agent turn
+    cacheable = SEMANTIC_CACHE_ENABLED and semantic_cache.is_cacheable(
+        request.query, request.customer_id
+    )
+    if cacheable:
+        cached, query_vector = await semantic_cache.get(request.query)
+        if cached is not None:
+            return AgentResponse(
+                status=cached["status"],
+                response=cached["response"],
+                data=dict(cached["data"] or {}, cached=True),
+            )
+    elif SEMANTIC_CACHE_ENABLED:
+        CACHE_LOOKUPS.inc(outcome="bypass")
+
     # Here you would integrate with your ADK agent
     # For now, return a mock response
 
-    return AgentResponse(
+    response = AgentResponse(
         status="success",
         response=f"Processed query: {request.query}",
         data={"customer_id": request.customer_id},
     )
 
+    if cacheable and response.status == "success":
+        semantic_cache.put(request.query, query_vector, response.model_dump())
+    return response
+
 
 @app.get("/health")
 async def health():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(
+        REGISTRY.render_prometheus(), media_type="text/plain; version=0.0.4"
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -0,0 +1,139 @@
+import os
+import math
+import time
+import asyncio
+import threading
+from fastapi import HTTPException, Depends
+
+from api.auth import verify_token
+from observability.metrics import REGISTRY
+
+# Token-bucket limits (requests per second and burst size)
+USER_RATE = float(os.getenv("API_USER_RATE", "1"))
+USER_BURST = int(os.getenv("API_USER_BURST", "5"))
+GLOBAL_RATE = float(os.getenv("API_GLOBAL_RATE", "20"))
+GLOBAL_BURST = int(os.getenv("API_GLOBAL_BURST", "40"))
+
+# Admission queue: requests running at once, requests allowed to wait, and
+# how long a waiting request may sit in the queue
+MAX_IN_FLIGHT = int(os.getenv("API_MAX_IN_FLIGHT", "8"))
+MAX_QUEUED = int(os.getenv("API_MAX_QUEUED", "16"))
+QUEUE_TIMEOUT = float(os.getenv("API_QUEUE_TIMEOUT", "10"))
+
+REQUESTS_SHED = REGISTRY.counter(
+    "api_requests_shed_total", "Requests rejected by rate limiting or admission control"
+)
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """Take one token. Returns 0 on success, else seconds until one is free"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def refund(self):
+        """Give back a token taken by try_acquire when the request is not admitted"""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + 1)
+
+
+class RateLimiter:
+    """Per-user buckets plus one global bucket shared by every user"""
+
+    def __init__(self, user_rate, user_burst, global_rate, global_burst):
+        self.user_rate = user_rate
+        self.user_burst = user_burst
+        self.global_bucket = TokenBucket(global_rate, global_burst)
+        self.user_buckets = {}
+        self._lock = threading.Lock()
+
+    def _user_bucket(self, username: str) -> TokenBucket:
+        with self._lock:
+            bucket = self.user_buckets.get(username)
+            if bucket is None:
+                bucket = TokenBucket(self.user_rate, self.user_burst)
+                self.user_buckets[username] = bucket
+            return bucket
+
+    def check(self, username: str):
+        """Raise 429 with Retry-After if the user or the whole API is over its rate"""
+        user_bucket = self._user_bucket(username)
+        wait = user_bucket.try_acquire()
+        scope = "user"
+        if not wait:
+            wait = self.global_bucket.try_acquire()
+            scope = "global"
+            if wait:
+                # Rejected by the global limit: the user's token was not spent
+                user_bucket.refund()
+        if wait:
+            REQUESTS_SHED.inc(reason=f"rate_limit_{scope}")
+            raise HTTPException(
+                status_code=429,
+                detail="Rate limit exceeded",
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+
+
+class AdmissionQueue:
+    """Bounded number of in-flight requests with a bounded wait queue"""
+
+    def __init__(self, max_in_flight: int, max_queued: int, timeout: float):
+        self.semaphore = asyncio.Semaphore(max_in_flight)
+        self.max_queued = max_queued
+        self.timeout = timeout
+        self.queued = 0
+
+    def _reject(self, reason: str):
+        REQUESTS_SHED.inc(reason=reason)
+        raise HTTPException(
+            status_code=503,
+            detail="Server busy, try again later",
+            headers={"Retry-After": str(math.ceil(self.timeout))},
+        )
+
+    async def acquire(self):
+        if self.semaphore.locked() and self.queued >= self.max_queued:
+            self._reject("queue_full")
+
+        self.queued += 1
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            self._reject("queue_timeout")
+        finally:
+            self.queued -= 1
+
+    def release(self):
+        self.semaphore.release()
+
+
+rate_limiter = RateLimiter(USER_RATE, USER_BURST, GLOBAL_RATE, GLOBAL_BURST)
+admission_queue = AdmissionQueue(MAX_IN_FLIGHT, MAX_QUEUED, QUEUE_TIMEOUT)
+
+
+async def admit_request(username: str = Depends(verify_token)):
+    """Dependency: authenticate, rate limit, then hold an in-flight slot"""
+    rate_limiter.check(username)
+    await admission_queue.acquire()
+    try:
+        yield username
+    finally:
+        admission_queue.release()
@@ -0,0 +1,164 @@
+import os
+import re
+import json
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+import numpy as np
+
+from observability.metrics import REGISTRY, timed
+
+# Opt-in: answers are only cached when this is set
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+SIMILARITY_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+TTL_SECONDS = float(os.getenv("SEMANTIC_CACHE_TTL", "3600"))
+MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "1000"))
+
+# Only generic product questions are cached, and their answers are shared by
+# every user. Every word of a cacheable query must be a stopword or product/FAQ
+# vocabulary; anything else (names, digits, emails, "my", "spent", "due", ...)
+# sends the query to the agent instead.
+# fmt: off
+STOPWORDS = frozenset("""
+    a an the is are was be do does can could would should will what which how
+    why when where who of for to on in with and or vs versus about between any
+    there that this these those it its have has get much many more most less
+    than no not without per at by from if me you your tell explain show list all
+    s
+""".split())
+FAQ_WORDS = frozenset("""
+    offer offered available product type kind option compare comparison
+    difference different feature benefit perk reward point cashback fee charge
+    cost annual monthly interest rate apr apy term length requirement require
+    need eligible eligibility criteria apply application open opening document
+    minimum maximum credit debit limit loan card account mortgage auto car
+    personal savings saving checking current deposit withdrawal overdraft
+    insurance travel foreign transaction best cheapest lowest highest fixed
+    variable repayment repay early penalty grace period late payment work use
+    student business new bank banking
+""".split())
+# fmt: on
+PRODUCTS_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "rag", "products", "products.json"
+)
+TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def _product_words(path: str = PRODUCTS_PATH) -> set:
+    try:
+        with open(path, "r") as f:
+            products = json.load(f)["products"]
+    except (OSError, ValueError, KeyError):
+        return set()
+    return {
+        word
+        for product in products
+        for word in TOKEN.findall(f"{product['name']} {product.get('type', '')}".lower())
+    }
+
+
+VOCABULARY = FAQ_WORDS | _product_words()
+
+
+def _is_vocabulary(token: str) -> bool:
+    return token in VOCABULARY or (token.endswith("s") and token[:-1] in VOCABULARY)
+
+
+CACHE_LOOKUPS = REGISTRY.counter(
+    "api_semantic_cache_lookups_total", "Semantic cache lookups by outcome"
+)
+
+
+class SemanticCache:
+    """Small in-memory vector index of previous answers.
+
+    Queries are embedded with the same MiniLM model ProductRAG uses. A lookup
+    returns the stored answer of the most similar unexpired query if its cosine
+    similarity is at least `threshold`. When full, expired entries are dropped
+    first, then the least recently used one.
+    """
+
+    def __init__(self, threshold: float, ttl: float, max_entries: int):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._model = None
+        self._model_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._vectors = None  # (max_entries, dim) matrix, allocated lazily
+        self._entries = {}  # slot -> (query, answer, expires_at)
+        self._lru = OrderedDict()  # slot -> None, least recently used first
+        self._free = list(range(max_entries))
+
+    def _get_model(self):
+        """Lazy load the embedding model only when the cache is used"""
+        with self._model_lock:
+            if self._model is None:
+                from sentence_transformers import SentenceTransformer
+                from rag.product_knowledge import EMBEDDING_MODEL
+
+                self._model = SentenceTransformer(EMBEDDING_MODEL)
+            return self._model
+
+    def _embed(self, query: str) -> np.ndarray:
+        with timed("api_semantic_cache_embedding_seconds", "Cache query embedding time"):
+            return self._get_model().encode(
+                [query], normalize_embeddings=True, convert_to_numpy=True
+            )[0].astype(np.float32)
+
+    @staticmethod
+    def is_cacheable(query: str, customer_id=None) -> bool:
+        """Allow-list: only stopwords and product/FAQ words, at least one of the latter"""
+        if customer_id is not None:
+            return False
+        tokens = TOKEN.findall(query.lower())
+        return (
+            all(token in STOPWORDS or _is_vocabulary(token) for token in tokens)
+            and any(_is_vocabulary(token) for token in tokens)
+        )
+
+    def _lookup(self, vector: np.ndarray):
+        now = time.monotonic()
+        with self._lock:
+            if not self._entries:
+                return None
+            slots = np.fromiter(self._entries.keys(), dtype=np.int64)
+            scores = self._vectors[slots] @ vector
+            for i in np.argsort(scores)[::-1]:
+                if scores[i] < self.threshold:
+                    break
+                slot = int(slots[i])
+                _, answer, expires_at = self._entries[slot]
+                if expires_at > now:
+                    self._lru.move_to_end(slot)
+                    return answer
+        return None
+
+    def put(self, query: str, vector: np.ndarray, answer: dict):
+        now = time.monotonic()
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.max_entries, len(vector)), np.float32)
+
+            if len(self._entries) >= self.max_entries:
+                expired = [s for s, e in self._entries.items() if e[2] <= now]
+                for slot in expired or [next(iter(self._lru))]:
+                    del self._entries[slot]
+                    del self._lru[slot]
+                    self._free.append(slot)
+
+            slot = self._free.pop()
+            self._vectors[slot] = vector
+            self._entries[slot] = (query, answer, now + self.ttl)
+            self._lru[slot] = None
+
+    async def get(self, query: str):
+        """Return (cached answer or None, query embedding) without blocking the loop"""
+        vector = await asyncio.to_thread(self._embed, query)
+        answer = self._lookup(vector)
+        CACHE_LOOKUPS.inc(outcome="hit" if answer is not None else "miss")
+        return answer, vector
+
+
+semantic_cache = SemanticCache(SIMILARITY_THRESHOLD, TTL_SECONDS, MAX_ENTRIES)
@@ -0,0 +1,195 @@
+# src/mcp/analytics.py - Columnar (Parquet + DuckDB) snapshot for reporting queries
+import os
+import re
+import shutil
+
+# Parquet snapshot location, next to banking.db
+SNAPSHOT_PATH = os.path.join(os.path.dirname(__file__), "db", "analytics")
+
+# Hive-style partition columns derived from the transaction date
+PARTITION_COLS = ["transaction_year", "transaction_month"]
+
+# Reports the analytics tool may run. Each one scans the whole snapshot, so
+# they are kept as a fixed set instead of accepting free-form SQL. The snapshot
+# has one row per transaction, so loan and card reports first reduce it to one
+# row per loan or card.
+REPORTS = {
+    "anomaly_rate_by_branch": """
+        SELECT branch_id,
+               COUNT(*) AS transactions,
+               SUM(CASE WHEN anomaly = -1 THEN 1 ELSE 0 END) AS anomalies,
+               ROUND(AVG(CASE WHEN anomaly = -1 THEN 1.0 ELSE 0.0 END), 4) AS anomaly_rate
+        FROM snapshot
+        {where}
+        GROUP BY branch_id
+        ORDER BY anomaly_rate DESC, branch_id
+    """,
+    "loan_approval_ratio_by_type": """
+        SELECT loan_type,
+               COUNT(*) AS loans,
+               SUM(CASE WHEN loan_status = 'Approved' THEN 1 ELSE 0 END) AS approved,
+               ROUND(AVG(CASE WHEN loan_status = 'Approved' THEN 1.0 ELSE 0.0 END), 4) AS approval_ratio,
+               ROUND(AVG(loan_amount), 2) AS avg_loan_amount,
+               ROUND(AVG(interest_rate), 2) AS avg_interest_rate
+        FROM (SELECT DISTINCT loan_id, loan_type, loan_status, loan_amount, interest_rate
+              FROM snapshot
+              {where})
+        GROUP BY loan_type
+        ORDER BY loan_type
+    """,
+    "transaction_volume_by_month": """
+        SELECT transaction_year, transaction_month, transaction_type,
+               COUNT(*) AS transactions,
+               ROUND(SUM(transaction_amount), 2) AS total_amount
+        FROM snapshot
+        {where}
+        GROUP BY transaction_year, transaction_month, transaction_type
+        ORDER BY transaction_year, transaction_month, transaction_type
+    """,
+    "card_utilisation_by_type": """
+        SELECT card_type,
+               COUNT(*) AS cards,
+               ROUND(AVG(credit_card_balance / NULLIF(credit_limit, 0)), 4) AS avg_utilisation,
+               ROUND(AVG(rewards_points), 1) AS avg_rewards_points
+        FROM (SELECT DISTINCT card_id, card_type, credit_card_balance, credit_limit,
+                              rewards_points
+              FROM snapshot
+              {where})
+        GROUP BY card_type
+        ORDER BY card_type
+    """,
+    "feedback_resolution_by_type": """
+        SELECT feedback_type,
+               COUNT(*) AS feedback,
+               ROUND(AVG(CASE WHEN resolution_status = 'Resolved' THEN 1.0 ELSE 0.0 END), 4) AS resolved_ratio
+        FROM snapshot
+        {where}
+        GROUP BY feedback_type
+        ORDER BY feedback_type
+    """,
+}
+
+# Column the `year` argument filters on. Transaction reports use the partition
+# column (so DuckDB skips other directories); loans and cards use their own date.
+YEAR_FILTERS = {
+    "loan_approval_ratio_by_type": "year(approval_rejection_date)",
+    "card_utilisation_by_type": "year(payment_due_date)",
+}
+
+
+def _snake_case(column: str) -> str:
+    """'Customer ID' -> customer_id, 'TransactionID' -> transaction_id"""
+    column = re.sub(r"(?<=[a-z])(?=ID)", " ", column)
+    return re.sub(r"[^0-9a-zA-Z]+", "_", column).strip("_").lower()
+
+
+def _swap_in(tmp_path: str, path: str):
+    """Replace `path` with `tmp_path` using renames only.
+
+    The old snapshot is moved aside before the new one is renamed into place,
+    so `path` is missing only between two renames and is never half deleted.
+    """
+    old_path = f"{path}.old"
+    shutil.rmtree(old_path, ignore_errors=True)
+    if os.path.isdir(path):
+        os.replace(path, old_path)
+    os.replace(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+
+def _prepare(df):
+    """CSV columns -> snapshot columns: snake_case names, dates, partition keys"""
+    import pandas as pd
+
+    snapshot = df.copy()
+    snapshot.columns = [_snake_case(c) for c in snapshot.columns]
+
+    for column in snapshot.columns:
+        if column.endswith("_date") or column == "date_of_account_opening":
+            snapshot[column] = pd.to_datetime(
+                snapshot[column], format="%m/%d/%Y", errors="coerce"
+            )
+
+    snapshot["transaction_year"] = snapshot["transaction_date"].dt.year.astype("Int64")
+    snapshot["transaction_month"] = snapshot["transaction_date"].dt.month.astype("Int64")
+    return snapshot
+
+
+class SnapshotWriter:
+    """Build a Parquet snapshot from one or more DataFrames.
+
+    Each `write` adds its own files to every partition it touches in a
+    temporary directory; `commit` swaps the finished snapshot into `path`.
+    """
+
+    def __init__(self, path: str = SNAPSHOT_PATH):
+        self.path = path
+        self.tmp_path = f"{path}.tmp"
+        self.parts = 0
+        self.rows = 0
+        shutil.rmtree(self.tmp_path, ignore_errors=True)
+
+    def write(self, df) -> int:
+        snapshot = _prepare(df)
+        snapshot.to_parquet(
+            self.tmp_path,
+            engine="pyarrow",
+            partition_cols=PARTITION_COLS,
+            index=False,
+            # Unique file names per part so later parts never overwrite earlier ones
+            basename_template=f"part-{self.parts:05d}-{{i}}.parquet",
+        )
+        self.parts += 1
+        self.rows += len(snapshot)
+        return len(snapshot)
+
+    def commit(self) -> int:
+        _swap_in(self.tmp_path, self.path)
+        return self.rows
+
+
+def write_parquet_snapshot(df, path: str = SNAPSHOT_PATH) -> int:
+    """Write the full CSV schema as a partitioned Parquet snapshot.
+
+    The new snapshot is written next to the old one and swapped in at the end,
+    so readers never see a half-written directory. Returns the row count.
+    """
+    writer = SnapshotWriter(path)
+    writer.write(df)
+    return writer.commit()
+
+
+def run_report(report: str, year: int = None, path: str = SNAPSHOT_PATH) -> list[dict]:
+    """Run a named report against the Parquet snapshot with DuckDB"""
+    import duckdb
+
+    if report not in REPORTS:
+        raise ValueError(
+            f"Unknown report: {report}. Available: {', '.join(sorted(REPORTS))}"
+        )
+    if not os.path.isdir(path):
+        raise FileNotFoundError(
+            f"Analytics snapshot not found at {path}. Run: python src/mcp/create_db.py"
+        )
+
+    where = ""
+    params = []
+    if year is not None:
+        where = f"WHERE {YEAR_FILTERS.get(report, 'transaction_year')} = ?"
+        params.append(int(year))
+
+    # In-memory DuckDB only reads the Parquet files; banking.db is never touched
+    conn = duckdb.connect(":memory:")
+    try:
+        conn.execute(
+            f"""
+            CREATE VIEW snapshot AS
+            SELECT * FROM read_parquet('{os.path.join(path, "**", "*.parquet")}',
+                                       hive_partitioning = true)
+            """
+        )
+        cursor = conn.execute(REPORTS[report].format(where=where), params)
+        columns = [d[0] for d in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    finally:
+        conn.close()
@@ -2,6 +2,7 @@
 import os
 import sqlite3
 import pandas as pd
+from analytics import SNAPSHOT_PATH, write_parquet_snapshot
 
 # Create directories
 os.makedirs("src/mcp/db", exist_ok=True)
@@ -20,6 +21,20 @@ df = pd.read_csv(csv_path)
 print(f"Loaded {len(df)} rows")
 print(f"Columns: {df.columns.tolist()}")
 
+# The CSV has M/D/YYYY dates; SQLite gets ISO YYYY-MM-DD text so ORDER BY on a
+# date column is chronological. `df` keeps the original for the snapshot.
+db_df = df.copy()
+for column in [
+    "Date Of Account Opening",
+    "Transaction Date",
+    "Approval/Rejection Date",
+    "Payment Due Date",
+    "Last Credit Card Payment Date",
+]:
+    db_df[column] = pd.to_datetime(db_df[column], format="%m/%d/%Y").dt.strftime(
+        "%Y-%m-%d"
+    )
+
 # Create database
 print(f"Creating database at {db_path}...")
 conn = sqlite3.connect(db_path)
@@ -60,8 +75,43 @@ CREATE TABLE IF NOT EXISTS transactions (
 """
 )
 
+# Create loans table
+cursor.execute(
+    """
+CREATE TABLE IF NOT EXISTS loans (
+    loan_id INTEGER PRIMARY KEY,
+    customer_id INTEGER,
+    loan_amount REAL,
+    loan_type TEXT,
+    interest_rate REAL,
+    loan_term INTEGER,
+    approval_rejection_date TEXT,
+    loan_status TEXT,
+    FOREIGN KEY (customer_id) REFERENCES customers(customer_id)
+)
+"""
+)
+
+# Create cards table
+cursor.execute(
+    """
+CREATE TABLE IF NOT EXISTS cards (
+    card_id INTEGER PRIMARY KEY,
+    customer_id INTEGER,
+    card_type TEXT,
+    credit_limit REAL,
+    credit_card_balance REAL,
+    minimum_payment_due REAL,
+    payment_due_date TEXT,
+    last_credit_card_payment_date TEXT,
+    rewards_points INTEGER,
+    FOREIGN KEY (customer_id) REFERENCES customers(customer_id)
+)
+"""
+)
+
 # Extract unique customers
-customers_df = df[
+customers_df = db_df[
     [
         "Customer ID",
         "First Name",
@@ -97,7 +147,7 @@ customers_df.columns = [
 customers_df.to_sql("customers", conn, if_exists="replace", index=False)
 
 # Extract transactions
-transactions_df = df[
+transactions_df = db_df[
     [
         "TransactionID",
         "Customer ID",
@@ -120,6 +170,64 @@ transactions_df.columns = [
 # Insert transactions
 transactions_df.to_sql("transactions", conn, if_exists="replace", index=False)
 
+# Extract loans
+loans_df = db_df[
+    [
+        "Loan ID",
+        "Customer ID",
+        "Loan Amount",
+        "Loan Type",
+        "Interest Rate",
+        "Loan Term",
+        "Approval/Rejection Date",
+        "Loan Status",
+    ]
+].drop_duplicates(subset=["Loan ID"])
+
+loans_df.columns = [
+    "loan_id",
+    "customer_id",
+    "loan_amount",
+    "loan_type",
+    "interest_rate",
+    "loan_term",
+    "approval_rejection_date",
+    "loan_status",
+]
+
+# Insert loans
+loans_df.to_sql("loans", conn, if_exists="replace", index=False)
+
+# Extract cards
+cards_df = db_df[
+    [
+        "CardID",
+        "Customer ID",
+        "Card Type",
+        "Credit Limit",
+        "Credit Card Balance",
+        "Minimum Payment Due",
+        "Payment Due Date",
+        "Last Credit Card Payment Date",
+        "Rewards Points",
+    ]
+].drop_duplicates(subset=["CardID"])
+
+cards_df.columns = [
+    "card_id",
+    "customer_id",
+    "card_type",
+    "credit_limit",
+    "credit_card_balance",
+    "minimum_payment_due",
+    "payment_due_date",
+    "last_credit_card_payment_date",
+    "rewards_points",
+]
+
+# Insert cards
+cards_df.to_sql("cards", conn, if_exists="replace", index=False)
+
 # Create indexes
 cursor.execute(
     """
@@ -135,6 +243,20 @@ ON transactions(transaction_date DESC)
 """
 )
 
+cursor.execute(
+    """
+CREATE INDEX IF NOT EXISTS idx_loans_customer_id 
+ON loans(customer_id)
+"""
+)
+
+cursor.execute(
+    """
+CREATE INDEX IF NOT EXISTS idx_cards_customer_id 
+ON cards(customer_id)
+"""
+)
+
 conn.commit()
 
 # Verify data
@@ -144,6 +266,12 @@ customers_count = cursor.fetchone()[0]
 cursor.execute("SELECT COUNT(*) FROM transactions")
 transactions_count = cursor.fetchone()[0]
 
+cursor.execute("SELECT COUNT(*) FROM loans")
+loans_count = cursor.fetchone()[0]
+
+cursor.execute("SELECT COUNT(*) FROM cards")
+cards_count = cursor.fetchone()[0]
+
 cursor.execute("SELECT customer_id, first_name, last_name FROM customers LIMIT 5")
 sample_customers = cursor.fetchall()
 
@@ -152,7 +280,17 @@ conn.close()
 print(f"\n✅ Database created successfully!")
 print(f"   Total customers: {customers_count}")
 print(f"   Total transactions: {transactions_count}")
+print(f"   Total loans: {loans_count}")
+print(f"   Total cards: {cards_count}")
 print(f"   Location: {db_path}")
 print(f"\nSample customers:")
 for cust in sample_customers:
     print(f"   - ID: {cust[0]}, Name: {cust[1]} {cust[2]}")
+
+# Columnar snapshot of the full CSV schema for reporting queries
+try:
+    snapshot_rows = write_parquet_snapshot(df)
+    print(f"\n✅ Analytics snapshot written ({snapshot_rows} rows)")
+    print(f"   Location: {SNAPSHOT_PATH}")
+except ImportError as e:
+    print(f"\n⚠️  Skipping analytics snapshot ({e}). Install pyarrow to enable it.")
@@ -0,0 +1,470 @@
+# src/mcp/generate_data.py - Seeded synthetic banking data for capacity testing
+#
+# Produces rows in the Comprehensive_Banking_Database.csv schema, one chunk of
+# customers at a time, so memory stays bounded however many rows are requested.
+#
+#   python src/mcp/generate_data.py --customers 1000000 --transactions-per-customer 20 \
+#       --csv data/synthetic.csv --db src/mcp/db/banking.db --parquet
+import os
+import time
+import sqlite3
+import argparse
+import numpy as np
+import pandas as pd
+from analytics import SNAPSHOT_PATH, SnapshotWriter
+
+# fmt: off
+CSV_COLUMNS = [
+    "Customer ID", "First Name", "Last Name", "Age", "Gender", "Address", "City",
+    "Contact Number", "Email", "Account Type", "Account Balance",
+    "Date Of Account Opening", "Last Transaction Date", "TransactionID",
+    "Transaction Date", "Transaction Type", "Transaction Amount",
+    "Account Balance After Transaction", "Branch ID", "Loan ID", "Loan Amount",
+    "Loan Type", "Interest Rate", "Loan Term", "Approval/Rejection Date",
+    "Loan Status", "CardID", "Card Type", "Credit Limit", "Credit Card Balance",
+    "Minimum Payment Due", "Payment Due Date", "Last Credit Card Payment Date",
+    "Rewards Points", "Feedback ID", "Feedback Date", "Feedback Type",
+    "Resolution Status", "Resolution Date", "Anomaly",
+]
+
+# Columns loaded into each SQLite table, in table order
+CUSTOMER_COLUMNS = CSV_COLUMNS[:12]
+TRANSACTION_COLUMNS = [
+    "TransactionID", "Customer ID", "Transaction Date", "Transaction Type",
+    "Transaction Amount", "Account Balance After Transaction",
+]
+LOAN_COLUMNS = [
+    "Loan ID", "Customer ID", "Loan Amount", "Loan Type", "Interest Rate",
+    "Loan Term", "Approval/Rejection Date", "Loan Status",
+]
+CARD_COLUMNS = [
+    "CardID", "Customer ID", "Card Type", "Credit Limit", "Credit Card Balance",
+    "Minimum Payment Due", "Payment Due Date", "Last Credit Card Payment Date",
+    "Rewards Points",
+]
+DATE_COLUMNS = [
+    "Date Of Account Opening", "Last Transaction Date", "Transaction Date",
+    "Approval/Rejection Date", "Payment Due Date", "Last Credit Card Payment Date",
+    "Feedback Date", "Resolution Date",
+]
+
+FIRST_NAMES = np.array([
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda",
+    "William", "Elizabeth", "David", "Barbara", "Richard", "Susan", "Joseph",
+    "Jessica", "Thomas", "Sarah", "Charles", "Karen", "Christopher", "Nancy",
+    "Daniel", "Lisa", "Matthew", "Betty", "Anthony", "Margaret", "Mark", "Sandra",
+    "Donald", "Ashley", "Steven", "Kimberly", "Paul", "Emily", "Andrew", "Donna",
+    "Joshua", "Michelle", "Kenneth", "Carol", "Kevin", "Amanda", "Brian", "Dorothy",
+    "George", "Melissa", "Timothy", "Ronald",
+])
+LAST_NAMES = np.array([
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+    "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson",
+    "Thomas", "Taylor", "Moore", "Jackson", "Martin", "Lee", "Perez", "Thompson",
+    "White", "Harris", "Sanchez", "Clark", "Ramirez", "Lewis", "Robinson", "Walker",
+    "Young", "Allen", "King", "Wright", "Scott", "Torres", "Nguyen", "Hill",
+    "Flores", "Green", "Adams", "Nelson", "Baker", "Hall", "Rivera", "Campbell",
+    "Mitchell", "Carter", "Roberts",
+])
+CITIES = np.array([
+    "Albuquerque", "Atlanta", "Austin", "Baltimore", "Boston", "Charlotte",
+    "Chicago", "Colorado Springs", "Columbus", "Dallas", "Denver", "Detroit",
+    "El Paso", "Fort Worth", "Fresno", "Houston", "Indianapolis", "Jacksonville",
+    "Kansas City", "Las Vegas", "Los Angeles", "Louisville", "Memphis", "Mesa",
+    "Milwaukee", "Nashville", "New York", "Oklahoma City", "Omaha", "Philadelphia",
+    "Phoenix", "Portland", "Sacramento", "San Antonio", "San Diego",
+    "San Francisco", "San Jose", "Seattle", "Tucson", "Washington",
+])
+# fmt: on
+EMAILS = np.array(
+    [f"{f.lower()}.{l.lower()}@kag.com" for f in FIRST_NAMES for l in LAST_NAMES]
+)
+GENDERS = np.array(["Male", "Female", "Other"])
+ACCOUNT_TYPES = np.array(["Savings", "Current"])
+TRANSACTION_TYPES = np.array(["Deposit", "Withdrawal", "Transfer"])
+LOAN_TYPES = np.array(["Mortgage", "Auto", "Personal"])
+LOAN_TERMS = np.array([12, 24, 36, 48, 60])
+LOAN_STATUSES = np.array(["Approved", "Rejected", "Closed"])
+CARD_TYPES = np.array(["Visa", "MasterCard", "AMEX"])
+FEEDBACK_TYPES = np.array(["Suggestion", "Complaint", "Praise"])
+RESOLUTION_STATUSES = np.array(["Resolved", "Pending"])
+
+# Share of transactions flagged as anomalies (-1), as in the source data
+ANOMALY_RATE = 0.06
+
+
+def _day(date: str) -> int:
+    return int(np.datetime64(date, "D").astype(np.int64))
+
+
+# Every date the generator can emit, pre-formatted as 'M/D/YYYY' (the CSV
+# format) and as ISO 'YYYY-MM-DD' (SQLite, where dates must sort as text), so
+# formatting a column is a single array lookup
+FIRST_DAY = _day("2000-01-01")
+LAST_DAY = _day("2023-12-31")
+_ALL_DAYS = np.arange(FIRST_DAY, LAST_DAY + 1).astype("datetime64[D]")
+DATE_STRINGS = np.array([f"{d.month}/{d.day}/{d.year}" for d in _ALL_DAYS.astype(object)])
+ISO_DATE_STRINGS = _ALL_DAYS.astype(str)
+
+
+def _random_days(rng, start: str, end: str, size) -> np.ndarray:
+    return rng.integers(_day(start), _day(end) + 1, size=size)
+
+
+def _dates(days: np.ndarray) -> pd.Categorical:
+    """Days since epoch -> 'M/D/YYYY' date column"""
+    return pd.Categorical.from_codes(days - FIRST_DAY, categories=DATE_STRINGS)
+
+
+def _pick(rng, choices: np.ndarray, size) -> pd.Categorical:
+    """Random string column, kept as category codes so no per-row strings are built"""
+    return pd.Categorical.from_codes(
+        rng.integers(0, len(choices), size), categories=choices
+    )
+
+
+def generate_chunk(rng, first_customer: int, n_customers: int, per_customer: int):
+    """Generate the rows for customers [first_customer, first_customer + n_customers)"""
+    n_rows = n_customers * per_customer
+    customer_ids = np.arange(first_customer, first_customer + n_customers)
+
+    # Row i belongs to customer i // per_customer
+    def per_row(values):
+        if isinstance(values, pd.Categorical):
+            return pd.Categorical.from_codes(
+                np.repeat(values.codes, per_customer), categories=values.categories
+            )
+        return np.repeat(values, per_customer)
+
+    # Customer-level attributes
+    first = rng.integers(0, len(FIRST_NAMES), n_customers)
+    last = rng.integers(0, len(LAST_NAMES), n_customers)
+    balance = np.round(rng.uniform(100, 10000, n_customers), 2)
+    addresses = pd.Categorical.from_codes(
+        np.arange(n_customers),
+        categories=np.char.add("Address_", customer_ids.astype(str)),
+    )
+
+    # Transactions: dates sorted per customer so the running balance is ordered
+    tx_days = np.sort(
+        _random_days(rng, "2023-01-01", "2023-12-31", (n_customers, per_customer)),
+        axis=1,
+    )
+    tx_types = rng.integers(0, len(TRANSACTION_TYPES), (n_customers, per_customer))
+    amounts = np.round(rng.uniform(10, 5000, (n_customers, per_customer)), 2)
+    signed = np.where(tx_types == 0, amounts, -amounts)
+    balance_after = np.round(balance[:, None] + np.cumsum(signed, axis=1), 2)
+
+    # One loan and one card per customer
+    loan_amount = np.round(rng.uniform(1000, 50000, n_customers), 2)
+    credit_limit = np.round(rng.uniform(1000, 10000, n_customers), 2)
+    card_balance = np.round(rng.uniform(1, 5000, n_customers), 2)
+
+    transaction_ids = (
+        (customer_ids[:, None] - 1) * per_customer + np.arange(1, per_customer + 1)
+    ).ravel()
+
+    return pd.DataFrame(
+        {
+            "Customer ID": per_row(customer_ids),
+            "First Name": per_row(pd.Categorical.from_codes(first, FIRST_NAMES)),
+            "Last Name": per_row(pd.Categorical.from_codes(last, LAST_NAMES)),
+            "Age": per_row(rng.integers(18, 70, n_customers)),
+            "Gender": per_row(_pick(rng, GENDERS, n_customers)),
+            "Address": per_row(addresses),
+            "City": per_row(_pick(rng, CITIES, n_customers)),
+            "Contact Number": per_row(19458794853 + customer_ids),
+            "Email": per_row(
+                pd.Categorical.from_codes(first * len(LAST_NAMES) + last, EMAILS)
+            ),
+            "Account Type": per_row(_pick(rng, ACCOUNT_TYPES, n_customers)),
+            "Account Balance": per_row(balance),
+            "Date Of Account Opening": per_row(
+                _dates(_random_days(rng, "2000-01-01", "2022-12-31", n_customers))
+            ),
+            "Last Transaction Date": per_row(_dates(tx_days[:, -1])),
+            "TransactionID": transaction_ids,
+            "Transaction Date": _dates(tx_days.ravel()),
+            "Transaction Type": pd.Categorical.from_codes(
+                tx_types.ravel(), TRANSACTION_TYPES
+            ),
+            "Transaction Amount": amounts.ravel(),
+            "Account Balance After Transaction": balance_after.ravel(),
+            "Branch ID": rng.integers(1, 100, n_rows),
+            "Loan ID": per_row(customer_ids),
+            "Loan Amount": per_row(loan_amount),
+            "Loan Type": per_row(_pick(rng, LOAN_TYPES, n_customers)),
+            "Interest Rate": per_row(np.round(rng.uniform(1, 10, n_customers), 2)),
+            "Loan Term": per_row(rng.choice(LOAN_TERMS, n_customers)),
+            "Approval/Rejection Date": per_row(
+                _dates(_random_days(rng, "2020-01-01", "2022-12-31", n_customers))
+            ),
+            "Loan Status": per_row(_pick(rng, LOAN_STATUSES, n_customers)),
+            "CardID": per_row(customer_ids),
+            "Card Type": per_row(_pick(rng, CARD_TYPES, n_customers)),
+            "Credit Limit": per_row(credit_limit),
+            "Credit Card Balance": per_row(card_balance),
+            "Minimum Payment Due": per_row(np.round(card_balance * 0.05, 2)),
+            "Payment Due Date": per_row(
+                _dates(_random_days(rng, "2023-01-01", "2023-12-31", n_customers))
+            ),
+            "Last Credit Card Payment Date": per_row(
+                _dates(_random_days(rng, "2023-01-01", "2023-12-31", n_customers))
+            ),
+            "Rewards Points": per_row(rng.integers(1, 10000, n_customers)),
+            "Feedback ID": transaction_ids,
+            "Feedback Date": _dates(
+                _random_days(rng, "2023-01-01", "2023-12-31", n_rows)
+            ),
+            "Feedback Type": _pick(rng, FEEDBACK_TYPES, n_rows),
+            "Resolution Status": _pick(rng, RESOLUTION_STATUSES, n_rows),
+            "Resolution Date": _dates(
+                _random_days(rng, "2023-01-01", "2023-12-31", n_rows)
+            ),
+            "Anomaly": np.where(rng.random(n_rows) < ANOMALY_RATE, -1, 1),
+        },
+        columns=CSV_COLUMNS,
+    )
+
+
+def iter_chunks(customers: int, per_customer: int, seed: int, chunk_rows: int):
+    """Yield DataFrames of whole customers, each with about `chunk_rows` rows.
+
+    Every chunk has its own generator seeded from (seed, chunk index), so the
+    output only depends on the arguments, not on how it is consumed.
+    """
+    chunk_customers = max(1, chunk_rows // per_customer)
+    for index, first in enumerate(range(1, customers + 1, chunk_customers)):
+        rng = np.random.default_rng([seed, index])
+        n_customers = min(chunk_customers, customers + 1 - first)
+        yield generate_chunk(rng, first, n_customers, per_customer)
+
+
+def _create_tables(conn):
+    """Same tables as create_db.py; indexes are built after the bulk load"""
+    conn.executescript(
+        """
+        DROP TABLE IF EXISTS customers;
+        DROP TABLE IF EXISTS transactions;
+        DROP TABLE IF EXISTS loans;
+        DROP TABLE IF EXISTS cards;
+
+        CREATE TABLE customers (
+            customer_id INTEGER PRIMARY KEY,
+            first_name TEXT,
+            last_name TEXT,
+            age INTEGER,
+            gender TEXT,
+            address TEXT,
+            city TEXT,
+            contact_number TEXT,
+            email TEXT,
+            account_type TEXT,
+            account_balance REAL,
+            date_of_account_opening TEXT
+        );
+
+        CREATE TABLE transactions (
+            transaction_id INTEGER PRIMARY KEY,
+            customer_id INTEGER,
+            transaction_date TEXT,
+            transaction_type TEXT,
+            transaction_amount REAL,
+            account_balance_after REAL,
+            FOREIGN KEY (customer_id) REFERENCES customers(customer_id)
+        );
+
+        CREATE TABLE loans (
+            loan_id INTEGER PRIMARY KEY,
+            customer_id INTEGER,
+            loan_amount REAL,
+            loan_type TEXT,
+            interest_rate REAL,
+            loan_term INTEGER,
+            approval_rejection_date TEXT,
+            loan_status TEXT,
+            FOREIGN KEY (customer_id) REFERENCES customers(customer_id)
+        );
+
+        CREATE TABLE cards (
+            card_id INTEGER PRIMARY KEY,
+            customer_id INTEGER,
+            card_type TEXT,
+            credit_limit REAL,
+            credit_card_balance REAL,
+            minimum_payment_due REAL,
+            payment_due_date TEXT,
+            last_credit_card_payment_date TEXT,
+            rewards_points INTEGER,
+            FOREIGN KEY (customer_id) REFERENCES customers(customer_id)
+        );
+        """
+    )
+
+
+def _rows(df):
+    """Row tuples of plain Python values (sqlite3 cannot bind NumPy scalars)"""
+    return zip(*(df[column].tolist() for column in df.columns))
+
+
+def _iso_dates(df):
+    """Swap the date columns' 'M/D/YYYY' categories for ISO ones (codes unchanged)"""
+    df = df.copy()
+    for column in DATE_COLUMNS:
+        df[column] = pd.Categorical.from_codes(
+            df[column].cat.codes, categories=ISO_DATE_STRINGS
+        )
+    return df
+
+
+def _insert_chunk(conn, df):
+    df = _iso_dates(df)
+    # Loans and cards are one per customer, like the customer row itself
+    customer_rows = df.drop_duplicates(subset=["Customer ID"])
+    customers = customer_rows[CUSTOMER_COLUMNS]
+    transactions = df[TRANSACTION_COLUMNS]
+
+    conn.executemany(
+        "INSERT INTO customers VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        _rows(customers),
+    )
+    conn.executemany(
+        "INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?)", _rows(transactions)
+    )
+    conn.executemany(
+        "INSERT INTO loans VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        _rows(customer_rows[LOAN_COLUMNS]),
+    )
+    conn.executemany(
+        "INSERT INTO cards VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        _rows(customer_rows[CARD_COLUMNS]),
+    )
+    conn.commit()
+
+
+def _write_csv(f, df):
+    """Append a chunk without header; pyarrow's writer is ~10x faster than pandas"""
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        df.to_csv(f, header=False, index=False)
+        return
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # Categorical columns arrive as dictionary arrays, which the writer rejects
+    table = pa.table(
+        {
+            name: column.cast(pa.string())
+            if pa.types.is_dictionary(column.type)
+            else column
+            for name, column in zip(table.column_names, table.columns)
+        }
+    )
+    pa_csv.write_csv(
+        table,
+        f,
+        pa_csv.WriteOptions(include_header=False, quoting_style="none"),
+    )
+
+
+def generate(
+    customers: int,
+    per_customer: int,
+    seed: int = 42,
+    csv_path: str = None,
+    db_path: str = None,
+    chunk_rows: int = 500_000,
+    parquet_path: str = None,
+):
+    """Stream generated chunks to a CSV file, SQLite and/or a Parquet snapshot"""
+    conn = None
+    if db_path:
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        conn = sqlite3.connect(db_path)
+        # Bulk load: no rollback journal or fsync per commit
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        _create_tables(conn)
+
+    csv_file = None
+    if csv_path:
+        csv_file = open(csv_path, "wb")
+        csv_file.write((",".join(CSV_COLUMNS) + "\n").encode("utf-8"))
+
+    snapshot = None
+    if parquet_path:
+        snapshot = SnapshotWriter(parquet_path)
+
+    total_rows = customers * per_customer
+    written = 0
+    start = time.perf_counter()
+    for df in iter_chunks(customers, per_customer, seed, chunk_rows):
+        if csv_file is not None:
+            _write_csv(csv_file, df)
+        if conn is not None:
+            _insert_chunk(conn, df)
+        if snapshot is not None:
+            snapshot.write(df)
+        written += len(df)
+        rate = written / (time.perf_counter() - start)
+        print(f"   {written:,}/{total_rows:,} rows ({rate:,.0f} rows/s)", end="\r")
+    print()
+
+    if csv_file is not None:
+        csv_file.close()
+
+    if snapshot is not None:
+        snapshot.commit()
+
+    if conn is not None:
+        print("Creating indexes...")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_customer_id ON transactions(customer_id)")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_transaction_date ON transactions(transaction_date DESC)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_loans_customer_id ON loans(customer_id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_cards_customer_id ON cards(customer_id)")
+        conn.commit()
+        conn.close()
+
+    print(f"\n✅ Generated {written:,} rows for {customers:,} customers")
+    if csv_path:
+        print(f"   CSV: {csv_path}")
+    if db_path:
+        print(f"   Database: {db_path}")
+    if parquet_path:
+        print(f"   Analytics snapshot: {parquet_path}")
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Generate synthetic banking data in the Comprehensive_Banking_Database.csv schema"
+    )
+    parser.add_argument("--customers", type=int, default=100_000)
+    parser.add_argument("--transactions-per-customer", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-rows", type=int, default=500_000)
+    parser.add_argument("--csv", help="Write rows to this CSV file")
+    parser.add_argument("--db", help="Write rows into this SQLite database")
+    parser.add_argument(
+        "--parquet",
+        nargs="?",
+        const=SNAPSHOT_PATH,
+        help=f"Write the analytics Parquet snapshot (default: {SNAPSHOT_PATH})",
+    )
+    args = parser.parse_args()
+
+    if not args.csv and not args.db and not args.parquet:
+        parser.error("Pass --csv, --db and/or --parquet")
+
+    generate(
+        args.customers,
+        args.transactions_per_customer,
+        seed=args.seed,
+        csv_path=args.csv,
+        db_path=args.db,
+        chunk_rows=args.chunk_rows,
+        parquet_path=args.parquet,
+    )
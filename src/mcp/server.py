@@ -1,11 +1,25 @@
 # src/mcp/server.py - Standard MCP Server for ADK
 import os
+import sys
+import asyncio
 import sqlite3
 import json
+import time
+import logging
+import threading
 import mcp.types as types
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from observability.metrics import REGISTRY, SIZE_BUCKETS, timed
+from analytics import REPORTS, run_report
+
+# stdout carries the MCP protocol, so logs go to stderr
+logging.basicConfig(stream=sys.stderr, level=logging.INFO)
+logger = logging.getLogger("banking-server")
+
 # Get API key from environment
 MCP_API_KEY = os.getenv("MCP_API_KEY", "banking-dev-token-2026")
 
@@ -17,23 +31,165 @@ server = Server("banking-server")
 
 # Lazy load RAG to avoid startup crashes
 _product_rag = None
+_product_rag_lock = threading.Lock()
+
+# Per-tool concurrency caps: (max running, max waiting). Expensive tools get a
+# small cap so a burst of them cannot starve the cheap point lookups.
+TOOL_CONCURRENCY = {
+    "search_bank_products": (2, 8),
+    "run_analytics_report": (1, 2),
+}
+DEFAULT_TOOL_CONCURRENCY = (8, 32)
+
+# How long a call may wait for a slot before it is shed
+TOOL_QUEUE_TIMEOUT = float(os.getenv("MCP_TOOL_QUEUE_TIMEOUT", "5"))
+
+# Tools served by list_tools; any other name is labelled "unknown" in metrics
+# so callers cannot create new series
+KNOWN_TOOLS = {
+    "get_customer_info",
+    "get_last_transactions",
+    "get_account_balance",
+    "get_customer_overview",
+    "search_bank_products",
+    "run_analytics_report",
+    "get_server_metrics",
+}
+
+# Per-tool metrics
+TOOL_LATENCY = REGISTRY.histogram(
+    "mcp_tool_latency_seconds", "End-to-end latency of MCP tool calls"
+)
+TOOL_RESPONSE_BYTES = REGISTRY.histogram(
+    "mcp_tool_response_bytes", "Size of MCP tool responses", buckets=SIZE_BUCKETS
+)
+TOOL_ERRORS = REGISTRY.counter(
+    "mcp_tool_errors_total", "MCP tool calls that returned an error"
+)
+COALESCED_CALLS = REGISTRY.counter(
+    "mcp_tool_calls_coalesced_total",
+    "Tool calls that joined an identical call already in flight",
+)
+
+# Arguments that are cast to int by the tools, so 1 and "1" coalesce
+INT_ARGUMENTS = {"customer_id", "limit", "year", "transaction_limit"}
+
+# Sections get_customer_overview can return
+OVERVIEW_SECTIONS = ["profile", "balance", "transactions", "loans", "cards"]
+
+# transaction_limit is clamped to this range (SQLite reads LIMIT -1 as no limit)
+MAX_OVERVIEW_TRANSACTIONS = 50
+
+
+class ToolBusyError(Exception):
+    """Raised when a tool call is shed because its limiter is full"""
+
+    def __init__(self, tool: str, retry_after: float):
+        super().__init__(f"Server busy: too many concurrent {tool} calls")
+        self.retry_after = retry_after
+
+
+class _ToolLimiter:
+    """Caps running calls per tool and bounds how many may wait for a slot"""
+
+    def __init__(self, name: str, max_running: int, max_waiting: int):
+        self.name = name
+        self.max_waiting = max_waiting
+        self.semaphore = asyncio.Semaphore(max_running)
+        self.waiting = 0
+
+    async def __aenter__(self):
+        if self.semaphore.locked() and self.waiting >= self.max_waiting:
+            raise ToolBusyError(self.name, TOOL_QUEUE_TIMEOUT)
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), TOOL_QUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise ToolBusyError(self.name, TOOL_QUEUE_TIMEOUT)
+        finally:
+            self.waiting -= 1
+
+    async def __aexit__(self, *exc):
+        self.semaphore.release()
+
+
+_tool_limiters = {}
+
+
+def _tool_label(name: str) -> str:
+    return name if name in KNOWN_TOOLS else "unknown"
+
+
+def _get_tool_limiter(name: str) -> _ToolLimiter:
+    """Unknown tool names share one limiter so they cannot grow the dict"""
+    key = name if name in TOOL_CONCURRENCY else "default"
+    if key not in _tool_limiters:
+        max_running, max_waiting = TOOL_CONCURRENCY.get(key, DEFAULT_TOOL_CONCURRENCY)
+        _tool_limiters[key] = _ToolLimiter(key, max_running, max_waiting)
+    return _tool_limiters[key]
+
+
+class _SingleFlight:
+    """Lets identical concurrent calls share one execution"""
+
+    def __init__(self):
+        self._in_flight = {}
+
+    async def do(self, key: tuple, fn):
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            COALESCED_CALLS.inc(tool=_tool_label(key[0]))
+        # shield: a caller that gives up must not cancel the call for the others
+        return await asyncio.shield(task)
+
+
+_single_flight = _SingleFlight()
+
+
+def _as_sections(value) -> list:
+    """A single section name is accepted as a one-item list"""
+    return [value] if isinstance(value, str) else list(value)
+
+
+def _coalesce_key(name: str, arguments: dict) -> tuple:
+    """Tool name plus normalised arguments, without the caller's api_key"""
+    normalised = {}
+    for key, value in arguments.items():
+        if key == "api_key":
+            continue
+        if key in INT_ARGUMENTS:
+            try:
+                value = int(value)
+            except (TypeError, ValueError):
+                pass
+        elif key == "sections" and isinstance(value, (list, str)):
+            value = sorted(set(_as_sections(value)))
+        elif key == "query" and isinstance(value, str):
+            # The MiniLM tokenizer is uncased, so case and spacing don't matter
+            value = " ".join(value.lower().split())
+        normalised[key] = value
+    return (name, json.dumps(normalised, sort_keys=True, default=str))
 
 
 def get_product_rag():
     """Lazy load RAG only when needed"""
     global _product_rag
-    if _product_rag is None:
-        try:
-            import sys
-
-            sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            from rag.product_knowledge import ProductRAG
-
-            _product_rag = ProductRAG()
-            print("✅ RAG initialized successfully")
-        except Exception as e:
-            print(f"⚠️  RAG initialization failed: {e}")
-            _product_rag = False  # Mark as failed
+    # Tools run in worker threads, so guard against loading the model twice
+    with _product_rag_lock:
+        if _product_rag is None:
+            try:
+                from rag.product_knowledge import ProductRAG
+
+                _product_rag = ProductRAG()
+                logger.info("✅ RAG initialized successfully")
+            except Exception as e:
+                logger.warning(f"⚠️  RAG initialization failed: {e}")
+                _product_rag = False  # Mark as failed
     return _product_rag if _product_rag is not False else None
 
 
@@ -107,6 +263,31 @@ async def list_tools() -> list[types.Tool]:
                 "required": ["customer_id", "api_key"],
             },
         ),
+        types.Tool(
+            name="get_customer_overview",
+            description="Get a customer's profile, balance, recent transactions, loans and cards in one call. Prefer this over calling get_customer_info, get_account_balance and get_last_transactions separately.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "customer_id": {
+                        "type": "integer",
+                        "description": "Customer ID number",
+                    },
+                    "sections": {
+                        "type": "array",
+                        "items": {"type": "string", "enum": OVERVIEW_SECTIONS},
+                        "description": "Sections to include (default: all)",
+                    },
+                    "transaction_limit": {
+                        "type": "integer",
+                        "description": f"Number of recent transactions to include (default 5, max {MAX_OVERVIEW_TRANSACTIONS})",
+                        "default": 5,
+                    },
+                    "api_key": {"type": "string", "description": "API key"},
+                },
+                "required": ["customer_id", "api_key"],
+            },
+        ),
         types.Tool(
             name="search_bank_products",
             description="Search for bank products using natural language query",
@@ -122,21 +303,141 @@ async def list_tools() -> list[types.Tool]:
                 "required": ["query", "api_key"],
             },
         ),
+        types.Tool(
+            name="run_analytics_report",
+            description="Run an aggregate report over all transactions, loans, cards and feedback (e.g. anomaly rate per branch, loan approval ratio)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "report": {
+                        "type": "string",
+                        "enum": sorted(REPORTS),
+                        "description": "Name of the report to run",
+                    },
+                    "year": {
+                        "type": "integer",
+                        "description": "Only include this year (optional): transaction year, loan decision year for loan reports, card payment due year for card reports",
+                    },
+                    "api_key": {"type": "string", "description": "API key"},
+                },
+                "required": ["report", "api_key"],
+            },
+        ),
+        types.Tool(
+            name="get_server_metrics",
+            description="Dump per-tool latency, DB, embedding and error metrics",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "api_key": {"type": "string", "description": "API key"},
+                },
+                "required": ["api_key"],
+            },
+        ),
     ]
 
 
-@server.call_tool()
-async def call_tool(name: str, arguments: dict) -> list[types.TextContent]:
-    """Execute tool calls"""
-    try:
-        api_key = arguments.get("api_key", "")
-        _require_auth(api_key)
-
-        if name == "get_customer_info":
-            conn = _connect_db()
-            cursor = conn.cursor()
-            customer_id = int(arguments["customer_id"])
-
+_tables = None
+
+
+def _get_tables(cursor) -> set:
+    """Table names, read once per process (loans/cards only exist in
+    databases built by the current create_db.py)"""
+    global _tables
+    if _tables is None:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        _tables = {row[0] for row in cursor.fetchall()}
+    return _tables
+
+
+def _get_customer_overview(
+    customer_id: int, sections: list[str], transaction_limit: int
+) -> dict:
+    """Fetch every requested section for a customer with a single SQL statement"""
+    conn = _connect_db()
+    cursor = conn.cursor()
+    tables = _get_tables(cursor)
+
+    # Each list section is a correlated subquery aggregated to a JSON array
+    subqueries = {
+        "transactions": """
+            (SELECT json_group_array(json_object(
+                        'id', transaction_id, 'date', transaction_date,
+                        'type', transaction_type, 'amount', transaction_amount,
+                        'balance_after', account_balance_after))
+             FROM (SELECT * FROM transactions
+                   WHERE customer_id = c.customer_id
+                   ORDER BY transaction_date DESC, transaction_id DESC
+                   LIMIT ?))
+        """,
+        "loans": """
+            (SELECT json_group_array(json_object(
+                        'id', loan_id, 'type', loan_type, 'amount', loan_amount,
+                        'interest_rate', interest_rate, 'term', loan_term,
+                        'status', loan_status,
+                        'decision_date', approval_rejection_date))
+             FROM loans WHERE customer_id = c.customer_id)
+        """,
+        "cards": """
+            (SELECT json_group_array(json_object(
+                        'id', card_id, 'type', card_type,
+                        'credit_limit', credit_limit,
+                        'balance', credit_card_balance,
+                        'minimum_payment_due', minimum_payment_due,
+                        'payment_due_date', payment_due_date,
+                        'rewards_points', rewards_points))
+             FROM cards WHERE customer_id = c.customer_id)
+        """,
+    }
+    list_sections = [
+        section
+        for section in ("transactions", "loans", "cards")
+        if section in sections and section in tables
+    ]
+    params = [transaction_limit] if "transactions" in list_sections else []
+    params.append(customer_id)
+
+    select_lists = "".join(f", {subqueries[section]}" for section in list_sections)
+    with timed("mcp_db_query_seconds", tool="get_customer_overview"):
+        cursor.execute(
+            f"""
+            SELECT c.customer_id, c.first_name, c.last_name, c.age, c.gender,
+                   c.email, c.account_type, c.account_balance {select_lists}
+            FROM customers c
+            WHERE c.customer_id = ?
+        """,
+            params,
+        )
+        row = cursor.fetchone()
+    conn.close()
+
+    if not row:
+        return {"status": "error", "error": f"Customer {customer_id} not found"}
+
+    result = {"status": "success", "customer_id": row[0]}
+    if "profile" in sections:
+        result["profile"] = {
+            "name": f"{row[1]} {row[2]}",
+            "age": row[3],
+            "gender": row[4],
+            "email": row[5],
+            "account_type": row[6],
+        }
+    if "balance" in sections:
+        result["balance"] = float(row[7])
+    for section, value in zip(list_sections, row[8:]):
+        result[section] = json.loads(value)
+    return result
+
+
+def _execute_tool(name: str, arguments: dict) -> dict:
+    """Run a tool and return its result dict (called in a worker thread)"""
+    if name == "get_customer_info":
+        conn = _connect_db()
+        cursor = conn.cursor()
+        customer_id = int(arguments["customer_id"])
+
+        with timed("mcp_db_query_seconds", tool=name):
             cursor.execute(
                 """
                 SELECT customer_id, first_name, last_name, age, gender,
@@ -146,133 +447,211 @@ async def call_tool(name: str, arguments: dict) -> list[types.TextContent]:
             """,
                 (customer_id,),
             )
-
             row = cursor.fetchone()
-            conn.close()
-
-            if not row:
-                result = {
-                    "status": "error",
-                    "error": f"Customer {customer_id} not found",
-                }
-            else:
-                result = {
-                    "status": "success",
-                    "customer": {
-                        "id": row[0],
-                        "name": f"{row[1]} {row[2]}",
-                        "age": row[3],
-                        "gender": row[4],
-                        "email": row[5],
-                        "account_type": row[6],
-                        "balance": float(row[7]),
-                    },
-                }
+        conn.close()
+
+        if not row:
+            result = {
+                "status": "error",
+                "error": f"Customer {customer_id} not found",
+            }
+        else:
+            result = {
+                "status": "success",
+                "customer": {
+                    "id": row[0],
+                    "name": f"{row[1]} {row[2]}",
+                    "age": row[3],
+                    "gender": row[4],
+                    "email": row[5],
+                    "account_type": row[6],
+                    "balance": float(row[7]),
+                },
+            }
 
-        elif name == "get_last_transactions":
-            conn = _connect_db()
-            cursor = conn.cursor()
-            customer_id = int(arguments["customer_id"])
-            limit = int(arguments.get("limit", 5))
+    elif name == "get_last_transactions":
+        conn = _connect_db()
+        cursor = conn.cursor()
+        customer_id = int(arguments["customer_id"])
+        limit = int(arguments.get("limit", 5))
 
+        with timed("mcp_db_query_seconds", tool=name):
             cursor.execute(
                 """
                 SELECT transaction_id, transaction_date, transaction_type,
                        transaction_amount, account_balance_after
                 FROM transactions
                 WHERE customer_id = ?
-                ORDER BY transaction_date DESC
+                ORDER BY transaction_date DESC, transaction_id DESC
                 LIMIT ?
             """,
                 (customer_id, limit),
             )
-
             rows = cursor.fetchall()
-            conn.close()
-
-            transactions = [
-                {
-                    "id": row[0],
-                    "date": row[1],
-                    "type": row[2],
-                    "amount": float(row[3]),
-                    "balance_after": float(row[4]),
-                }
-                for row in rows
-            ]
-
-            result = {
-                "status": "success",
-                "customer_id": customer_id,
-                "transactions": transactions,
-                "count": len(transactions),
+        conn.close()
+
+        transactions = [
+            {
+                "id": row[0],
+                "date": row[1],
+                "type": row[2],
+                "amount": float(row[3]),
+                "balance_after": float(row[4]),
             }
+            for row in rows
+        ]
+
+        result = {
+            "status": "success",
+            "customer_id": customer_id,
+            "transactions": transactions,
+            "count": len(transactions),
+        }
 
-        elif name == "get_account_balance":
-            conn = _connect_db()
-            cursor = conn.cursor()
-            customer_id = int(arguments["customer_id"])
+    elif name == "get_account_balance":
+        conn = _connect_db()
+        cursor = conn.cursor()
+        customer_id = int(arguments["customer_id"])
 
+        with timed("mcp_db_query_seconds", tool=name):
             cursor.execute(
                 """
                 SELECT account_balance FROM customers WHERE customer_id = ?
             """,
                 (customer_id,),
             )
-
             row = cursor.fetchone()
-            conn.close()
-
-            if not row:
-                result = {
-                    "status": "error",
-                    "error": f"Customer {customer_id} not found",
-                }
-            else:
-                result = {
-                    "status": "success",
-                    "customer_id": customer_id,
-                    "balance": float(row[0]),
-                }
-
-        elif name == "search_bank_products":
-            query = arguments["query"]
-
-            # Lazy load RAG
-            rag = get_product_rag()
-
-            if rag is None:
-                result = {
-                    "status": "error",
-                    "error": "Product search unavailable. Run: python src/rag/create_vector_db.py",
-                }
-            else:
-                products = rag.search_products(query, n_results=3)
-                result = {
-                    "status": "success",
-                    "query": query,
-                    "products": [p["product"] for p in products],
-                    "count": len(products),
-                }
+        conn.close()
+
+        if not row:
+            result = {
+                "status": "error",
+                "error": f"Customer {customer_id} not found",
+            }
+        else:
+            result = {
+                "status": "success",
+                "customer_id": customer_id,
+                "balance": float(row[0]),
+            }
 
+    elif name == "get_customer_overview":
+        customer_id = int(arguments["customer_id"])
+        sections = _as_sections(arguments.get("sections") or OVERVIEW_SECTIONS)
+        unknown = set(sections) - set(OVERVIEW_SECTIONS)
+        if unknown:
+            result = {
+                "status": "error",
+                "error": f"Unknown sections: {', '.join(sorted(unknown))}",
+            }
         else:
-            result = {"status": "error", "error": f"Unknown tool: {name}"}
+            transaction_limit = min(
+                max(int(arguments.get("transaction_limit", 5)), 1),
+                MAX_OVERVIEW_TRANSACTIONS,
+            )
+            result = _get_customer_overview(customer_id, sections, transaction_limit)
+
+    elif name == "search_bank_products":
+        query = arguments["query"]
 
-        return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
+        # Lazy load RAG
+        rag = get_product_rag()
+
+        if rag is None:
+            result = {
+                "status": "error",
+                "error": "Product search unavailable. Run: python src/rag/create_vector_db.py",
+            }
+        else:
+            products = rag.search_products(query, n_results=3)
+            result = {
+                "status": "success",
+                "query": query,
+                "products": [
+                    {**p["product"], "excerpts": p["excerpts"]}
+                    if "excerpts" in p
+                    else p["product"]
+                    for p in products
+                ],
+                "count": len(products),
+            }
+
+    elif name == "run_analytics_report":
+        report = arguments["report"]
+        year = arguments.get("year")
+
+        # Full scans run on DuckDB over the Parquet snapshot, so they never
+        # hold up the SQLite point lookups
+        try:
+            with timed("mcp_analytics_query_seconds", report=report):
+                rows = run_report(report, year)
+            result = {
+                "status": "success",
+                "report": report,
+                "rows": rows,
+                "count": len(rows),
+            }
+        except ImportError:
+            result = {
+                "status": "error",
+                "error": "Analytics unavailable. Install duckdb and pyarrow, then run: python src/mcp/create_db.py",
+            }
+        except (ValueError, FileNotFoundError) as e:
+            # Unknown report or no snapshot yet: tell the caller, no traceback
+            result = {"status": "error", "error": str(e)}
+
+    elif name == "get_server_metrics":
+        result = {"status": "success", "metrics": REGISTRY.snapshot()}
+
+    else:
+        result = {"status": "error", "error": f"Unknown tool: {name}"}
+
+    return result
+
+
+async def _run_limited(name: str, arguments: dict) -> dict:
+    """Tool bodies are blocking (SQLite, encode, DuckDB), so they run in a
+    worker thread once the tool's concurrency limiter admits the call"""
+    async with _get_tool_limiter(name):
+        return await asyncio.to_thread(_execute_tool, name, arguments)
+
+
+@server.call_tool()
+async def call_tool(name: str, arguments: dict) -> list[types.TextContent]:
+    """Execute tool calls"""
+    start = time.perf_counter()
+    tool = _tool_label(name)
+    try:
+        api_key = arguments.get("api_key", "")
+        _require_auth(api_key)
+
+        # Every caller is authenticated above; only then may it share the
+        # result of an identical call that is already running
+        result = await _single_flight.do(
+            _coalesce_key(name, arguments),
+            lambda: _run_limited(name, arguments),
+        )
+
+        if result["status"] == "error":
+            TOOL_ERRORS.inc(tool=tool, kind="result")
+        text = json.dumps(result, indent=2, default=str)
 
     except PermissionError as e:
-        return [
-            types.TextContent(
-                type="text", text=json.dumps({"status": "error", "error": str(e)})
-            )
-        ]
+        TOOL_ERRORS.inc(tool=tool, kind="auth")
+        text = json.dumps({"status": "error", "error": str(e)})
+    except ToolBusyError as e:
+        TOOL_ERRORS.inc(tool=tool, kind="busy")
+        text = json.dumps(
+            {"status": "error", "error": str(e), "retry_after": e.retry_after}
+        )
     except Exception as e:
-        return [
-            types.TextContent(
-                type="text",
-                text=json.dumps({"status": "error", "error": f"Error: {str(e)}"}),
-            )
-        ]
+        TOOL_ERRORS.inc(tool=tool, kind=type(e).__name__)
+        logger.exception("Tool %s failed", name)
+        text = json.dumps({"status": "error", "error": f"Error: {str(e)}"})
+
+    TOOL_LATENCY.observe(time.perf_counter() - start, tool=tool)
+    TOOL_RESPONSE_BYTES.observe(len(text.encode("utf-8")), tool=tool)
+    return [types.TextContent(type="text", text=text)]
 
 
 async def main():
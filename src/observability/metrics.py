@@ -0,0 +1,187 @@
+# src/observability/metrics.py - In-process metrics and optional tracing
+import time
+import threading
+from contextlib import contextmanager, nullcontext
+
+# OpenTelemetry is optional: spans are only emitted when the API is installed
+try:
+    from opentelemetry import trace as _otel_trace
+
+    _tracer = _otel_trace.get_tracer("banking")
+except ImportError:
+    _tracer = None
+
+# Latency buckets in seconds (covers sub-ms SQLite lookups up to slow LLM calls)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Payload buckets in bytes
+SIZE_BUCKETS = (128, 512, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(label_key: tuple, extra: tuple = ()) -> str:
+    pairs = list(label_key) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class Counter:
+    """Monotonic counter keyed by label set"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def snapshot(self) -> list[dict]:
+        with self._lock:
+            return [
+                {"labels": dict(key), "value": value}
+                for key, value in self._values.items()
+            ]
+
+    def render(self) -> list[str]:
+        with self._lock:
+            return [
+                f"{self.name}{_format_labels(key)} {value}"
+                for key, value in self._values.items()
+            ]
+
+
+class Histogram:
+    """Fixed-bucket histogram keyed by label set"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, description: str, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+                self._series[key] = series
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][i] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def snapshot(self) -> list[dict]:
+        with self._lock:
+            return [
+                {
+                    "labels": dict(key),
+                    "count": series["count"],
+                    "sum": round(series["sum"], 6),
+                    "avg": round(series["sum"] / series["count"], 6)
+                    if series["count"]
+                    else 0.0,
+                    "buckets": dict(zip((str(b) for b in self.buckets), series["counts"])),
+                }
+                for key, series in self._series.items()
+            ]
+
+    def render(self) -> list[str]:
+        lines = []
+        with self._lock:
+            for key, series in self._series.items():
+                for bound, count in zip(self.buckets, series["counts"]):
+                    lines.append(
+                        f"{self.name}_bucket{_format_labels(key, (('le', str(bound)),))} {count}"
+                    )
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(key, (('le', '+Inf'),))} {series['count']}"
+                )
+                lines.append(f"{self.name}_sum{_format_labels(key)} {series['sum']}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {series['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds every metric of the process and renders them"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, description: str, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, description, **kwargs)
+                self._metrics[name] = metric
+            return metric
+
+    def counter(self, name: str, description: str = "") -> Counter:
+        return self._get_or_create(Counter, name, description)
+
+    def histogram(
+        self, name: str, description: str = "", buckets=LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, description, buckets=buckets)
+
+    def snapshot(self) -> dict:
+        """Return all metrics as a JSON-serialisable dict"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {
+            metric.name: {"type": metric.kind, "series": metric.snapshot()}
+            for metric in metrics
+        }
+
+    def render_prometheus(self) -> str:
+        """Return all metrics in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            if metric.description:
+                lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry shared by the MCP server, RAG and API
+REGISTRY = MetricsRegistry()
+
+
+@contextmanager
+def timed(metric_name: str, description: str = "", **labels):
+    """Record the duration of the block in a histogram and, if available, a span"""
+    histogram = REGISTRY.histogram(metric_name, description)
+    span_cm = (
+        _tracer.start_as_current_span(metric_name) if _tracer is not None else nullcontext()
+    )
+    with span_cm as span:
+        if span is not None:
+            for key, value in labels.items():
+                span.set_attribute(key, str(value))
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            histogram.observe(time.perf_counter() - start, **labels)
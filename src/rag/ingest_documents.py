@@ -0,0 +1,228 @@
+# src/rag/ingest_documents.py - Chunk and embed long product documents
+#
+# Documents live in one folder per product, named after its id in products.json:
+#
+#   src/rag/products/documents/card_visa/terms_and_conditions.pdf
+#   src/rag/products/documents/loan_mortgage/fee_schedule.md
+#
+# Each file is split into overlapping word windows. Files are grouped into
+# tasks that a process pool extracts, chunks and embeds in large batches, and
+# the main process streams each finished task into the chunk collection.
+import os
+import json
+import argparse
+import chromadb
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from product_knowledge import EMBEDDING_MODEL, CHUNK_COLLECTION
+
+DOCS_PATH = "src/rag/products/documents"
+PRODUCTS_PATH = "src/rag/products/products.json"
+CHROMA_PATH = "src/rag/products/chroma_db"
+
+SUPPORTED_EXTENSIONS = {".txt", ".md", ".pdf"}
+
+# ~200 words stays under MiniLM's 256 word-piece limit
+CHUNK_WORDS = 200
+OVERLAP_WORDS = 40
+
+# Files are grouped until a task holds this many bytes, so small files still
+# share one large encode batch
+TASK_BYTES = 2 * 1024 * 1024
+EMBED_BATCH = 256
+
+# Rows per write to the vector store
+WRITE_BATCH = 1000
+
+# Set in each worker process by _init_worker
+_model = None
+
+
+def _read_pages(path: str) -> list[str]:
+    """Return the text of a document, one string per page"""
+    if path.lower().endswith(".pdf"):
+        from pypdf import PdfReader
+
+        return [page.extract_text() or "" for page in PdfReader(path).pages]
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return [f.read()]
+
+
+def chunk_pages(pages: list[str], chunk_words: int, overlap_words: int):
+    """Split pages into overlapping word windows.
+
+    Yields (text, page_number) where page_number is the 1-based page the
+    chunk starts on.
+    """
+    words = []
+    page_of_word = []
+    for page_number, text in enumerate(pages, start=1):
+        page_words = text.split()
+        words.extend(page_words)
+        page_of_word.extend([page_number] * len(page_words))
+
+    step = max(1, chunk_words - overlap_words)
+    for start in range(0, len(words), step):
+        yield " ".join(words[start : start + chunk_words]), page_of_word[start]
+        if start + chunk_words >= len(words):
+            break
+
+
+def _init_worker(threads: int):
+    """Load the embedding model once per worker process"""
+    global _model
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    # Split the cores between workers instead of every worker using all of them
+    torch.set_num_threads(threads)
+    _model = SentenceTransformer(EMBEDDING_MODEL)
+
+
+def _process_task(files: list[tuple], chunk_words: int, overlap_words: int) -> dict:
+    """Extract, chunk and embed a group of files (runs in a worker process)"""
+    ids, documents, metadatas, sources, errors = [], [], [], [], []
+    for path, source, product_id in files:
+        try:
+            pages = _read_pages(path)
+        except Exception as e:
+            errors.append(f"{source}: {e}")
+            continue
+
+        sources.append(source)
+        for index, (text, page) in enumerate(
+            chunk_pages(pages, chunk_words, overlap_words)
+        ):
+            ids.append(f"{source}#{index}")
+            documents.append(text)
+            metadatas.append(
+                {
+                    "product_id": product_id,
+                    "source": source,
+                    "chunk_index": index,
+                    "page": page,
+                }
+            )
+
+    embeddings = []
+    if documents:
+        embeddings = _model.encode(
+            documents,
+            batch_size=EMBED_BATCH,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+        ).tolist()
+
+    return {
+        "ids": ids,
+        "documents": documents,
+        "metadatas": metadatas,
+        "embeddings": embeddings,
+        "sources": sources,
+        "errors": errors,
+    }
+
+
+def find_documents(docs_path: str, product_ids: set) -> list[tuple]:
+    """Return (path, source, product_id) for every supported file"""
+    found = []
+    if not os.path.isdir(docs_path):
+        return found
+    for product_id in sorted(os.listdir(docs_path)):
+        product_dir = os.path.join(docs_path, product_id)
+        if not os.path.isdir(product_dir):
+            continue
+        if product_id not in product_ids:
+            print(f"⚠️  Skipping {product_dir}: no product with id '{product_id}'")
+            continue
+        for root, _, names in os.walk(product_dir):
+            for name in sorted(names):
+                if os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS:
+                    path = os.path.join(root, name)
+                    found.append((path, os.path.relpath(path, docs_path), product_id))
+    return found
+
+
+def _group_tasks(files: list[tuple]) -> list[list[tuple]]:
+    tasks, current, size = [], [], 0
+    for file in files:
+        current.append(file)
+        size += os.path.getsize(file[0])
+        if size >= TASK_BYTES:
+            tasks.append(current)
+            current, size = [], 0
+    if current:
+        tasks.append(current)
+    return tasks
+
+
+def ingest_documents(
+    docs_path: str = DOCS_PATH,
+    workers: int = None,
+    chunk_words: int = CHUNK_WORDS,
+    overlap_words: int = OVERLAP_WORDS,
+):
+    with open(PRODUCTS_PATH, "r") as f:
+        product_ids = {p["id"] for p in json.load(f)["products"]}
+
+    files = find_documents(docs_path, product_ids)
+    if not files:
+        print(f"No documents found in {docs_path}")
+        return 0
+
+    client = chromadb.PersistentClient(path=CHROMA_PATH)
+    collection = client.get_or_create_collection(
+        name=CHUNK_COLLECTION,
+        metadata={"description": "Chunks of long product documents"},
+    )
+
+    workers = workers or os.cpu_count() or 1
+    tasks = _group_tasks(files)
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    print(f"Ingesting {len(files)} files in {len(tasks)} tasks with {workers} workers")
+
+    total_chunks = 0
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(threads,)
+    ) as executor:
+        futures = [
+            executor.submit(_process_task, task, chunk_words, overlap_words)
+            for task in tasks
+        ]
+        for done, future in enumerate(as_completed(futures), start=1):
+            result = future.result()
+            for error in result["errors"]:
+                print(f"⚠️  {error}")
+
+            # Re-ingesting a file replaces all of its previous chunks
+            for source in result["sources"]:
+                collection.delete(where={"source": source})
+
+            for start in range(0, len(result["ids"]), WRITE_BATCH):
+                end = start + WRITE_BATCH
+                collection.add(
+                    ids=result["ids"][start:end],
+                    documents=result["documents"][start:end],
+                    metadatas=result["metadatas"][start:end],
+                    embeddings=result["embeddings"][start:end],
+                )
+            total_chunks += len(result["ids"])
+            print(f"   {done}/{len(tasks)} tasks, {total_chunks} chunks", end="\r")
+    print()
+
+    print(f"✅ Indexed {total_chunks} chunks from {len(files)} documents")
+    print(f"📁 Location: {CHROMA_PATH} (collection '{CHUNK_COLLECTION}')")
+    return total_chunks
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Chunk and embed product documents (.txt, .md, .pdf)"
+    )
+    parser.add_argument("--docs", default=DOCS_PATH)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-words", type=int, default=CHUNK_WORDS)
+    parser.add_argument("--overlap-words", type=int, default=OVERLAP_WORDS)
+    args = parser.parse_args()
+
+    ingest_documents(args.docs, args.workers, args.chunk_words, args.overlap_words)
@@ -1,23 +1,103 @@
+import os
+import sys
 import chromadb
 from sentence_transformers import SentenceTransformer
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from observability.metrics import timed
+
+# Shared with the API's semantic cache so both embed into the same space
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+# Chunks of long product documents, written by ingest_documents.py
+CHUNK_COLLECTION = "bank_product_chunks"
+
+# Chunk hits fetched per requested product, before grouping by product
+CHUNKS_PER_PRODUCT = 5
+
+# Excerpts returned with each product
+MAX_EXCERPTS = 2
+
 
 class ProductRAG:
     def __init__(self):
-        self.model = SentenceTransformer("all-MiniLM-L6-v2")
+        self.model = SentenceTransformer(EMBEDDING_MODEL)
         self.client = chromadb.PersistentClient(path="src/rag/products/chroma_db")
         self.collection = self.client.get_collection("bank_products")
+        self.chunks = None
+
+    def _get_chunks(self):
+        """Chunk collection, looked up until ingest_documents.py has created it"""
+        if self.chunks is None:
+            try:
+                self.chunks = self.client.get_collection(CHUNK_COLLECTION)
+            except Exception:
+                return None  # No documents ingested yet
+        return self.chunks
 
     def search_products(self, query: str, n_results: int = 3):
         """Search for relevant products"""
-        results = self.collection.query(query_texts=[query], n_results=n_results)
+        # Embed explicitly so encode and vector search are timed separately
+        with timed("rag_embedding_seconds", "Query embedding time"):
+            embedding = self.model.encode([query]).tolist()
 
-        products = []
-        for i, metadata in enumerate(results["metadatas"][0]):
-            products.append(
-                {"product": metadata, "relevance_score": results["distances"][0][i]}
+        with timed("rag_vector_search_seconds", "Vector store query time"):
+            results = self.collection.query(
+                query_embeddings=embedding, n_results=n_results
             )
 
+        # Best (lowest) distance per product across both collections
+        scores = {}
+        metadatas = {}
+        for i, metadata in enumerate(results["metadatas"][0]):
+            scores[metadata["id"]] = results["distances"][0][i]
+            metadatas[metadata["id"]] = metadata
+
+        excerpts = {}
+        chunks = self._get_chunks()
+        if chunks is not None and chunks.count() > 0:
+            with timed("rag_vector_search_seconds", "Vector store query time"):
+                chunk_results = chunks.query(
+                    query_embeddings=embedding,
+                    n_results=n_results * CHUNKS_PER_PRODUCT,
+                )
+            # Hits come back closest first, so the first ones per product win
+            for document, metadata, distance in zip(
+                chunk_results["documents"][0],
+                chunk_results["metadatas"][0],
+                chunk_results["distances"][0],
+            ):
+                product_id = metadata["product_id"]
+                scores[product_id] = min(scores.get(product_id, distance), distance)
+                product_excerpts = excerpts.setdefault(product_id, [])
+                if len(product_excerpts) < MAX_EXCERPTS:
+                    product_excerpts.append(
+                        {
+                            "text": document,
+                            "source": metadata["source"],
+                            "page": metadata["page"],
+                        }
+                    )
+
+        ranked = sorted(scores, key=scores.get)[:n_results]
+        missing = [product_id for product_id in ranked if product_id not in metadatas]
+        if missing:
+            found = self.collection.get(ids=missing)
+            metadatas.update(zip(found["ids"], found["metadatas"]))
+
+        products = []
+        for product_id in ranked:
+            if product_id not in metadatas:
+                continue  # Chunks of a product that is no longer in the catalogue
+            product = {
+                "product": metadatas[product_id],
+                "relevance_score": scores[product_id],
+            }
+            if product_id in excerpts:
+                product["excerpts"] = excerpts[product_id]
+            products.append(product)
+
         return products
 
     def get_product_by_id(self, product_id: str):